@@ -1,9 +1,35 @@
-from .journal import Journal
+import importlib as _importlib
 from .account import Account, QName, ChartOfAccounts, load_accounts, write_accounts
 from .txn import Posting, Txn, txn_from_postings, load_txns, write_txns
 from .bassertion import BAssertion, load_balances, write_bassertions
-from .bank_import import BankCsv, import_bank_csv
-from .budget import RPosting, Budget, load_rpostings
+
+# Modules that depend on dateutil are only imported when one of their names is
+# first accessed.
+_LAZY = {
+    "Journal": "journal",
+    "BankCsv": "bank_import",
+    "import_bank_csv": "bank_import",
+    "RPosting": "budget",
+    "Budget": "budget",
+    "load_rpostings": "budget",
+}
+
+
+def __getattr__(name: str):
+    if name in _LAZY:
+        mod = _importlib.import_module("." + _LAZY[name], __name__)
+        val = getattr(mod, name)
+        globals()[name] = val
+        return val
+    if name in _LAZY.values():
+        # Importing a submodule binds it as an attribute of the package
+        return _importlib.import_module("." + name, __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__) | set(_LAZY.values()))
+
 
 __all__ = ["Journal", "Account", "QName", "ChartOfAccounts", "load_accounts", "write_accounts",
            "Posting", "Txn", "txn_from_postings", "load_txns", "write_txns",
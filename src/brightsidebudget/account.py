@@ -1,7 +1,29 @@
 import csv
+import re
+import sys
 from pathlib import PosixPath
 from typing import Callable, Iterable, Union
-from brightsidebudget.tag import all_tags, clean_tags, HasTags
+from brightsidebudget.parsing import csv_rows
+from brightsidebudget.tag import all_tags, HasTags
+
+# Sort order of the five top accounts. The names are interned so that lookups
+# with the interned first element of a QName succeed on identity.
+_TOP_ORDER = {sys.intern(k): v for k, v in {
+    "Actifs": 1,
+    "Passifs": 2,
+    "Capitaux propres": 3,
+    "Revenus": 4,
+    "Dépenses": 5
+}.items()}
+
+# The names allowed as the first element of an account in a Journal
+TOP_ACCOUNTS = frozenset(_TOP_ORDER)
+
+# A valid qualified name is one or more non-empty elements separated by colons
+_QNAME_RE = re.compile(r"[^:]+(?::[^:]+)*")
+
+# Marks a lazily computed attribute that has not been computed yet
+_UNSET = object()
 
 
 class QName():
@@ -10,22 +32,35 @@ class QName():
     "Assets:Checking" is an account that represents a checking account in the
     Assets category.
     """
-    def __init__(self, qname: str | list[str]):
-        if isinstance(qname, list):
+    __slots__ = ("_qstr", "_qlist", "_hash", "_sort_key", "_parent", "_prefix")
+
+    def __init__(self, qname: str | list[str] | tuple[str, ...]):
+        if isinstance(qname, (list, tuple)):
             if not qname:
                 raise ValueError("Empty qname.")
-            self._qstr = ':'.join(qname)
-            self._qlist = qname
+            qlist = tuple(qname)
+            qstr = ':'.join(qlist)
+            if qstr.count(':') != len(qlist) - 1:
+                raise ValueError("Colon in element.")
         else:
             if not qname:
                 raise ValueError("Empty qname.")
-            self._qstr = qname
-            self._qlist = qname.split(':')
+            # sys.intern only accepts exact str objects
+            qstr = str(qname)
+            qlist = None
 
-        if any([x == "" for x in self._qlist]):
+        if not _QNAME_RE.fullmatch(qstr):
             raise ValueError("Empty element in qname.")
-        if any([":" in x for x in self._qlist]):
-            raise ValueError("Colon in element.")
+        if qlist is None:
+            qlist = tuple(qstr.split(':'))
+
+        self._qstr = sys.intern(qstr)
+        self._qlist = (sys.intern(str(qlist[0])),) + qlist[1:]
+        self._hash = hash(self._qstr)
+        self._sort_key = (_TOP_ORDER.get(self._qlist[0], 6), self._qlist)
+        self._parent = _UNSET
+        # Every descendant's qstr starts with this prefix
+        self._prefix = self._qstr + ":"
 
     @property
     def qstr(self) -> str:
@@ -35,9 +70,9 @@ class QName():
         return self._qstr
 
     @property
-    def qlist(self) -> list[str]:
+    def qlist(self) -> tuple[str, ...]:
         """
-        The qualified name as a list of elements.
+        The qualified name as a tuple of elements.
         """
         return self._qlist
 
@@ -60,9 +95,9 @@ class QName():
         """
         The parent QName.
         """
-        if len(self._qlist) == 1:
-            return None
-        return QName(self._qlist[:-1])
+        if self._parent is _UNSET:
+            self._parent = None if len(self._qlist) == 1 else QName(self._qlist[:-1])
+        return self._parent
 
     def is_descendant_of(self, parent: Union['QName', str]) -> bool:
         """
@@ -70,10 +105,7 @@ class QName():
         """
         if isinstance(parent, str):
             parent = QName(parent)
-        if self.depth <= parent.depth:
-            # You can't be a descendant if you have fewer or equal elements
-            return False
-        return self._qlist[:parent.depth] == parent._qlist
+        return self._qstr.startswith(parent._prefix)
 
     def is_parent_of(self, qname: Union['QName', str]) -> bool:
         """
@@ -84,35 +116,36 @@ class QName():
         return qname.is_descendant_of(self)
 
     @property
-    def sort_key(self) -> tuple[int, list[str]]:
+    def sort_key(self) -> tuple[int, tuple[str, ...]]:
         """
         Returns a tuple that can be used for sorting.
         Ensures that the parent comes before the children and that the five
         top accounts come in the proper order. (Actifs, Passifs, Capitaux propres, Revenus,
         Dépenses)
         """
-        order = {
-            "Actifs": 1,
-            "Passifs": 2,
-            "Capitaux propres": 3,
-            "Revenus": 4,
-            "Dépenses": 5
-        }
-        return (order.get(self._qlist[0], 6), self._qlist)
+        return self._sort_key
 
     def __eq__(self, other) -> bool:
+        if self is other:
+            # Journal objects share the QName instances of the chart of accounts
+            return True
         if isinstance(other, QName):
-            return self._qstr == other._qstr
+            return self._hash == other._hash and self._qstr == other._qstr
         return False
 
     def __hash__(self) -> int:
-        return hash(self._qstr)
+        return self._hash
 
     def __lt__(self, other) -> bool:
         if isinstance(other, QName):
             return self._qlist < other._qlist
         return False
 
+    def __reduce__(self):
+        # The cached hash depends on the process hash seed, so it must be
+        # recomputed when unpickled in another process.
+        return (QName, (self._qstr,))
+
     def __str__(self):
         return self._qstr
 
@@ -125,6 +158,8 @@ class Account(HasTags):
     An Account represents a single financial entity where transactions occur. It
     is basically a QName with optional tags.
     """
+    __slots__ = ("qname",)
+
     def __init__(self, *, qname: QName | str, tags: dict[str, str] | None = None):
         super().__init__(tags)
         if isinstance(qname, str):
@@ -138,7 +173,12 @@ class Account(HasTags):
         return self.__str__()
 
     def copy(self):
-        return Account(qname=self.qname, tags=self.tags.copy())
+        # The QName is immutable and already validated, so the copy is built
+        # directly from the slots without going through __init__.
+        a = Account.__new__(Account)
+        a.qname = self.qname
+        a.tags = self.tags.copy()
+        return a
 
 
 def load_accounts(accounts: str, encoding: str = "utf8") -> list['Account']:
@@ -148,14 +188,17 @@ def load_accounts(accounts: str, encoding: str = "utf8") -> list['Account']:
     tags are optional and are key-value pairs.
     """
     accs = []
-    with open(accounts, 'r', encoding=encoding) as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            qname = row["Compte"]
-            d = row.copy()
-            clean_tags(d, forbidden=["Compte"], err_ctx=qname)
-
-            accs.append(Account(qname=qname, tags=d))
+    with open(accounts, 'r', encoding=encoding, buffering=1 << 20, newline='') as f:
+        idx, rows = csv_rows(csv.reader(f), ctx_cols=["Compte"])
+        if not idx:
+            return accs
+        name_idx = idx["Compte"]
+        tag_cols = [(i, h) for h, i in idx.items() if h != "Compte"]
+        for row in rows:
+            qname = row[name_idx]
+            tags = {h: row[i] for i, h in tag_cols if row[i] and not row[i].isspace()}
+
+            accs.append(Account(qname=qname, tags=tags))
     return accs
 
 
@@ -168,17 +211,12 @@ def write_accounts(*,
     """
     accounts = sorted(accounts, key=lambda x: x.qname.sort_key)
 
-    with open(file, "w", encoding=encoding) as f:
+    with open(file, "w", encoding=encoding, buffering=1 << 20, newline='') as f:
         writer = csv.writer(f, lineterminator="\n")
-        header = ["Compte"]
         a_tag_keys = all_tags(accounts)
-        header += a_tag_keys
-        writer.writerow(header)
-        for a in accounts:
-            row = [a.qname]
-            for k in a_tag_keys:
-                row.append(a.tags.get(k, ""))
-            writer.writerow(row)
+        writer.writerow(["Compte", *a_tag_keys])
+        writer.writerows([a.qname.qstr, *(a.tags.get(k, "") for k in a_tag_keys)]
+                         for a in accounts)
 
 
 class ChartOfAccounts:
@@ -186,10 +224,29 @@ class ChartOfAccounts:
         # _full_qname_dict: A dictionary that maps a full qualified name to an
         # account
         self._full_qname_dict: dict[QName, Account] = {}
-        # _short_qname_dict: A dictionary that maps a short qualified name to a
-        # list of matching accounts
-        self._short_qname_dict: dict[QName, list[Account]] = {}
-        self.short_qname_min_length: Callable[[QName], int] = lambda x: 1
+        # _short_qname_dict: A dictionary that maps a short qualified name,
+        # stored as a tuple of its elements, to a list of matching accounts
+        self._short_qname_dict: dict[tuple[str, ...], list[Account]] = {}
+        # _child_count: A dictionary that maps a full qualified name to its
+        # number of immediate children. Leaf accounts are absent.
+        self._child_count: dict[QName, int] = {}
+        # _short_cache: A dictionary that maps a full qualified name to its
+        # short qualified name. Cleared whenever the result could change.
+        self._short_cache: dict[QName, QName] = {}
+        self._short_qname_min_length: Callable[[QName], int] = lambda x: 1
+
+    @property
+    def short_qname_min_length(self) -> Callable[[QName], int]:
+        """
+        A function that returns the minimum number of elements of the short
+        qualified name of an account.
+        """
+        return self._short_qname_min_length
+
+    @short_qname_min_length.setter
+    def short_qname_min_length(self, value: Callable[[QName], int]):
+        self._short_qname_min_length = value
+        self._short_cache.clear()
 
     @property
     def accounts(self) -> Iterable[Account]:
@@ -215,10 +272,11 @@ class ChartOfAccounts:
         if isinstance(qname, str):
             qname = QName(qname=qname)
 
+        key = qname._qlist
         if qname in self._full_qname_dict:
             return self._full_qname_dict[qname]
-        elif qname in self._short_qname_dict:
-            ls = self._short_qname_dict[qname]
+        elif key in self._short_qname_dict:
+            ls = self._short_qname_dict[key]
             if len(ls) == 1:
                 return ls[0]
             raise ValueError(f'Account {qname} is ambiguous')
@@ -232,10 +290,11 @@ class ChartOfAccounts:
         if isinstance(qname, str):
             qname = QName(qname=qname)
 
+        key = qname._qlist
         if qname in self._full_qname_dict:
             return True
-        elif qname in self._short_qname_dict:
-            return len(self._short_qname_dict[qname]) == 1
+        elif key in self._short_qname_dict:
+            return len(self._short_qname_dict[key]) == 1
         else:
             return False
 
@@ -247,16 +306,24 @@ class ChartOfAccounts:
 
         # We try all possible short names starting from shortest to longest
         acc = self.account(qname)
+        if acc.qname in self._short_cache:
+            return self._short_cache[acc.qname]
+
+        short_name = acc.qname
         qlist = acc.qname._qlist
-        min_length = min(max(self.short_qname_min_length(acc.qname), 1), len(qlist))
+        min_length = min(max(self._short_qname_min_length(acc.qname), 1), len(qlist))
         for i in range(min_length, len(qlist)):
-            short_name = QName(qlist[-i:])
-            if short_name in self._full_qname_dict:
+            key = qlist[-i:]
+            if len(self._short_qname_dict[key]) != 1:
+                continue
+            candidate = QName(key)
+            if candidate in self._full_qname_dict:
                 continue
-            if len(self._short_qname_dict[short_name]) == 1:
-                return short_name
-        # No short name found
-        return acc.qname
+            short_name = candidate
+            break
+        # If no short name is found, the full qualified name is used
+        self._short_cache[acc.qname] = short_name
+        return short_name
 
     def full_qname(self, qname: QName | str) -> QName:
         """
@@ -268,11 +335,7 @@ class ChartOfAccounts:
         """
         Returns True if the account is a leaf account.
         """
-        full_qname = self.full_qname(qname)
-        for a in self._full_qname_dict.values():
-            if a.qname.is_descendant_of(full_qname):
-                return False
-        return True
+        return self._child_count.get(self.full_qname(qname), 0) == 0
 
     def add_accounts(self, accounts: list[Account]):
         """
@@ -280,6 +343,7 @@ class ChartOfAccounts:
         Verifies that the accounts do not already exist and that the immediate
         parent of each account exists.
         """
+        self._short_cache.clear()
         for a in accounts:
             if a.qname in self._full_qname_dict:
                 raise ValueError(f'Account {a.qname} already exists')
@@ -287,14 +351,16 @@ class ChartOfAccounts:
             parent = a.qname.parent
             if parent and parent not in self._full_qname_dict:
                 raise ValueError(f'Parent account {parent} does not exist')
+            if parent:
+                self._child_count[parent] = self._child_count.get(parent, 0) + 1
 
             self._full_qname_dict[a.qname] = a
             qlist = a.qname._qlist
             for idx in range(1, len(qlist)):
-                short_name = QName(qlist[-idx:])
-                if short_name not in self._short_qname_dict:
-                    self._short_qname_dict[short_name] = []
-                self._short_qname_dict[short_name].append(a)
+                key = qlist[-idx:]
+                if key not in self._short_qname_dict:
+                    self._short_qname_dict[key] = []
+                self._short_qname_dict[key].append(a)
 
     def max_depth(self) -> int:
         """
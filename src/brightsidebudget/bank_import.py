@@ -1,16 +1,21 @@
 
 import csv
+from collections import Counter
 from datetime import date
 from decimal import Decimal
-from io import StringIO
-from typing import Callable, Union
+from itertools import islice
+from typing import Callable, Iterable, Iterator, Union
 from brightsidebudget.account import QName
 from brightsidebudget.journal import Journal
+from brightsidebudget.parsing import csv_rows, to_date, to_decimal
 from brightsidebudget.txn import Posting, Txn
 
 
 # This modules provides the building blocks to import bank transactions from a CSV file
 
+_ZERO = Decimal(0)
+
+
 class BankCsv():
     """
     Configuration for importing bank transactions from a CSV file.
@@ -46,70 +51,116 @@ class BankCsv():
         self.skiprows = skiprows
         self.dictreader_args = dictreader_args or {}
 
+    def _remove_unquoted_delimiter(self, lines: Iterable[str]) -> Iterator[str]:
+        """
+        Yields the lines with each unquoted text replaced by its version
+        without delimiter.
+        """
+        d = self.dictreader_args.get("separator", ",")
+        # The texts are replaced one after the other, so a text may match the
+        # result of a previous replacement
+        pairs = [(x, x.replace(d, "")) for x in self.remove_delimiter_from]
+
+        for line in lines:
+            for x, y in pairs:
+                line = line.replace(x, y)
+            yield line
+
     def import_bank_postings(self, txnid: int = 1) -> list[Posting]:
         """
         Import bank postings from the CSV file.
 
         Returns a list of Posting objects with extra fields as tags.
         """
+        return list(self.iter_bank_postings(txnid=txnid))
 
-        def remove_unquoted_delimiter(content: str) -> str:
-            d = self.dictreader_args.get("separator", ",")
-            for x in self.remove_delimiter_from:
-                content = content.replace(x, x.replace(d, ""))
-            return content
-
-        if self.remove_delimiter_from:
-            with open(self.file, "r", encoding=self.encoding) as f:
-                content = f.read()
-            content = remove_unquoted_delimiter(content)
-            file = StringIO(content)
-        else:
-            file = open(self.file, "r", encoding=self.encoding)
-
-        ps = []
-        with file as f:
-            for _ in range(self.skiprows):
-                next(f)
-            for row in csv.DictReader(f, **self.dictreader_args):
-                dt = date.fromisoformat(row[self.date_col])
-                if self.amount_col:
-                    amnt = Decimal(row[self.amount_col]) if row[self.amount_col] else Decimal(0)
-                else:
-                    in_col = row[self.amount_in_col] if row[self.amount_in_col] else "0"
-                    out_col = row[self.amount_out_col] if row[self.amount_out_col] else "0"
-                    amnt_in = Decimal(in_col)
-                    amnt_out = Decimal(out_col)
-                    amnt = amnt_in - amnt_out
-                stmt_desc = []
-                for k in self.stmt_desc_cols:
-                    if row[k]:
-                        stmt_desc.append(row[k])
-                stmt_desc = " | ".join(stmt_desc)
-                if self.stmt_date_col:
-                    stmt_dt = row[self.stmt_date_col]
+    def iter_bank_postings(self, txnid: int = 1) -> Iterator[Posting]:
+        """
+        Like import_bank_postings, but yields the postings one at a time while
+        the CSV file is read.
+        """
+
+        # csv.reader accepts the dialect arguments of csv.DictReader, but not
+        # its own arguments
+        reader_args = dict(self.dictreader_args)
+        fieldnames = reader_args.pop("fieldnames", None)
+        reader_args.pop("restkey", None)
+        reader_args.pop("restval", None)
+
+        acc_qname = self.acc_qname
+        stmt_date_col = self.stmt_date_col
+
+        with open(self.file, "r", encoding=self.encoding, buffering=1 << 20, newline='') as f:
+            lines = islice(f, self.skiprows, None)
+            if self.remove_delimiter_from:
+                lines = self._remove_unquoted_delimiter(lines)
+            # Extra columns are ignored
+            idx, rows = csv_rows(csv.reader(lines, **reader_args), header=fieldnames)
+            if not idx:
+                return
+
+            # Resolve the configured columns to positions once
+            date_i = idx[self.date_col]
+            stmt_date_i = idx[stmt_date_col] if stmt_date_col else None
+            desc_is = tuple(idx[k] for k in self.stmt_desc_cols)
+            drop_cols = {x for x in [self.date_col, self.amount_col, self.amount_in_col,
+                                     self.amount_out_col, stmt_date_col] if x}
+            if len(desc_is) == 1:
+                drop_cols.add(self.stmt_desc_cols[0])
+            tag_cols = [(i, h) for h, i in idx.items() if h not in drop_cols]
+
+            if not desc_is:
+                def stmt_desc_of(row: list[str]) -> str:
+                    return ""
+            elif len(desc_is) == 1:
+                desc_i = desc_is[0]
+
+                def stmt_desc_of(row: list[str]) -> str:
+                    return row[desc_i]
+            else:
+                def stmt_desc_of(row: list[str]) -> str:
+                    return " | ".join([row[i] for i in desc_is if row[i]])
+
+            if self.amount_col:
+                amount_i = idx[self.amount_col]
+
+                def parse_amount(row: list[str]) -> Decimal:
+                    s = row[amount_i]
+                    return to_decimal(s) if s else _ZERO
+            else:
+                in_i = idx[self.amount_in_col]
+                out_i = idx[self.amount_out_col]
+
+                def parse_amount(row: list[str]) -> Decimal:
+                    s_in = row[in_i]
+                    s_out = row[out_i]
+                    amnt_in = to_decimal(s_in) if s_in else _ZERO
+                    amnt_out = to_decimal(s_out) if s_out else _ZERO
+                    return amnt_in - amnt_out
+
+            for row in rows:
+                dt = to_date(row[date_i])
+                amnt = parse_amount(row)
+                stmt_desc = stmt_desc_of(row)
+                if stmt_date_i is not None:
+                    # An empty statement date falls back to the posting date
+                    s = row[stmt_date_i]
+                    stmt_dt = to_date(s) if s else dt
                 else:
                     stmt_dt = dt
-                d = row.copy()
-                for x in [self.date_col, self.amount_col, self.amount_in_col, self.amount_out_col,
-                          self.stmt_date_col]:
-                    if x:
-                        d.pop(x, None)
-                if len(self.stmt_desc_cols) == 1:
-                    d.pop(self.stmt_desc_cols[0], None)
-                p = Posting(txnid=txnid, date=dt, acc_qname=self.acc_qname, amount=amnt,
-                            stmt_desc=stmt_desc, stmt_date=stmt_dt, tags=d)
-                ps.append(p)
+                d = {h: row[i] for i, h in tag_cols}
+                yield Posting(txnid=txnid, date=dt, acc_qname=acc_qname, amount=amnt,
+                              stmt_desc=stmt_desc, stmt_date=stmt_dt, tags=d)
                 txnid += 1
-        return ps
 
 
-def import_bank_csv(journal: Journal, conf: BankCsv,
+def import_bank_csv(journal: Journal, conf: BankCsv | list[BankCsv],
                     classifier: Callable[[Posting], Txn | list[Txn] | None],
                     only_after: date | None = None) -> list[Txn]:
     """
-    Import bank transactions from a CSV file into the journal. Filters out
-    duplicates already in the journal. Returns the list of accepted postings.
+    Import bank transactions from one or more CSV files into the journal.
+    Filters out duplicates already in the journal. Returns the list of
+    accepted postings.
 
     If the conf does not use the full qualified name, it will be converted to
     a full qualified name.
@@ -117,47 +168,57 @@ def import_bank_csv(journal: Journal, conf: BankCsv,
     The classifier function should take a Posting object and return a list of Txn
     objects that represent the transactions to be added to the journal. If the
     Txn object is not accepted, the classifier should return None.
+
+    When several confs are given, they are imported in order, exactly as if
+    import_bank_csv was called once for each of them, but the journal postings
+    are only scanned once per bank account.
     """
-    # Use full qualified name
-    conf.acc_qname = journal.chartOfAccounts.full_qname(conf.acc_qname)
-
-    # import bank csv
-    bank_ps: list[Posting] = conf.import_bank_postings(txnid=journal.next_txn_id)
-
-    # Build deduplication dictionary
-    dedup_ps: list[Posting] = []
-    for p in journal.postings:
-        if p.acc_qname == conf.acc_qname or p.acc_qname.is_descendant_of(conf.acc_qname):
-            dedup_ps.append(p)
-
-    dedup_dict = {}
-    for p in dedup_ps:
-        key = p.date, p.amount, p.stmt_desc
-        if key not in dedup_dict:
-            dedup_dict[key] = 0
-        dedup_dict[key] += 1
-
-    # Filter out duplicates
-    new_ps: list[Posting] = []
-    for p in bank_ps:
-        if only_after and p.date <= only_after:
-            continue
-        key = p.date, p.amount, p.stmt_desc
-        if key in dedup_dict:
-            dedup_dict[key] -= 1
-            if dedup_dict[key] == 0:
-                dedup_dict.pop(key)
-        else:
-            new_ps.append(p)
+    confs = conf if isinstance(conf, list) else [conf]
+
+    # Deduplication counters of the journal postings, by bank account. They
+    # are kept up to date with the transactions added by each conf.
+    known: dict[QName, Counter] = {}
 
-    # Classify and add txns
     accepted_txns: list[Txn] = []
-    for p in new_ps:
-        ts = classifier(p)
-        if isinstance(ts, Txn):
-            ts = [ts]
-        if ts:
-            accepted_txns.extend(ts)
-    journal.add_txns(accepted_txns)
+    for conf in confs:
+        # Use full qualified name
+        conf.acc_qname = journal.chartOfAccounts.full_qname(conf.acc_qname)
+        acc_qname = conf.acc_qname
+
+        # Build deduplication dictionary
+        if acc_qname not in known:
+            known[acc_qname] = Counter(
+                (p.date, p.amount, p.stmt_desc) for p in journal.postings
+                if p.acc_qname == acc_qname or p.acc_qname.is_descendant_of(acc_qname))
+        dedup_dict = known[acc_qname].copy()
+
+        # Stream the bank postings, filter out duplicates and classify the new ones
+        conf_txns: list[Txn] = []
+        for p in conf.iter_bank_postings(txnid=journal.next_txn_id):
+            if only_after and p.date <= only_after:
+                continue
+            key = p.date, p.amount, p.stmt_desc
+            c = dedup_dict.get(key)
+            if c:
+                if c == 1:
+                    del dedup_dict[key]
+                else:
+                    dedup_dict[key] = c - 1
+                continue
+
+            ts = classifier(p)
+            if isinstance(ts, Txn):
+                ts = [ts]
+            if ts:
+                conf_txns.extend(ts)
+        journal.add_txns(conf_txns)
+        accepted_txns.extend(conf_txns)
+
+        # The added postings are now part of the journal
+        for p in (p for t in conf_txns for p in t.postings):
+            key = p.date, p.amount, p.stmt_desc
+            for a, counter in known.items():
+                if p.acc_qname == a or p.acc_qname.is_descendant_of(a):
+                    counter[key] += 1
 
     return accepted_txns
@@ -1,9 +1,11 @@
 import csv
 from datetime import date
 from decimal import Decimal
+from operator import attrgetter
 from pathlib import PosixPath
 from typing import Callable, Iterable
-from brightsidebudget.account import QName, clean_tags
+from brightsidebudget.account import QName
+from brightsidebudget.parsing import csv_rows, to_date, to_decimal
 from brightsidebudget.tag import HasTags, all_tags
 
 
@@ -12,6 +14,8 @@ class BAssertion(HasTags):
     A BAssertion (Balance Assertion) is a statement that a certain account
     should have a specific balance at a certain date.
     """
+    __slots__ = ("date", "acc_qname", "balance")
+
     def __init__(self, *, date: date, acc_qname: QName | str, balance: Decimal,
                  tags: dict[str, str] | None = None):
         super().__init__(tags)
@@ -26,8 +30,14 @@ class BAssertion(HasTags):
         return self.__str__()
 
     def copy(self):
-        return BAssertion(date=self.date, acc_qname=self.acc_qname, balance=self.balance,
-                          tags=self.tags.copy())
+        # The fields are already validated, so the copy does not go through
+        # __init__. Only the mutable tags need to be copied.
+        b = BAssertion.__new__(BAssertion)
+        b.date = self.date
+        b.acc_qname = self.acc_qname
+        b.balance = self.balance
+        b.tags = self.tags.copy()
+        return b
 
 
 def load_balances(balances: str, encoding: str = "utf8") -> list[BAssertion]:
@@ -37,17 +47,27 @@ def load_balances(balances: str, encoding: str = "utf8") -> list[BAssertion]:
     account.
     """
     bs = []
-    with open(balances, 'r', encoding=encoding) as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            dt = date.fromisoformat(row["Date"])
-            acc = row["Compte"]
-            balance = Decimal(row["Solde"])
-            d = row.copy()
-            ctx = f"{dt} {acc} {balance}"
-            clean_tags(d, forbidden=["Date", "Compte", "Solde"], err_ctx=ctx)
+    # The same accounts come back on many rows, parse each name once
+    qnames: dict[str, QName] = {}
+    with open(balances, 'r', encoding=encoding, newline='') as f:
+        idx, rows = csv_rows(csv.reader(f), ctx_cols=["Date", "Compte", "Solde"])
+        if not idx:
+            return bs
+        date_idx = idx["Date"]
+        acc_idx = idx["Compte"]
+        balance_idx = idx["Solde"]
+        tag_cols = [(i, h) for h, i in idx.items() if h not in ("Date", "Compte", "Solde")]
+        for row in rows:
+            # Assertions are often at the same dates and round balances
+            dt = to_date(row[date_idx])
+            acc = row[acc_idx]
+            balance = to_decimal(row[balance_idx])
+            d = {h: row[i] for i, h in tag_cols if row[i] and not row[i].isspace()}
 
-            bs.append(BAssertion(date=dt, acc_qname=acc, balance=balance, tags=d))
+            qname = qnames.get(acc)
+            if qname is None:
+                qname = qnames[acc] = QName(acc)
+            bs.append(BAssertion(date=dt, acc_qname=qname, balance=balance, tags=d))
     return bs
 
 
@@ -63,16 +83,12 @@ def write_bassertions(*,
         def short_name(qname: QName) -> QName:
             return qname
 
-    bassertions = sorted(bassertions, key=lambda x: (x.date, x.acc_qname.sort_key))
+    bassertions = sorted(bassertions, key=attrgetter("date", "acc_qname.sort_key"))
 
     with open(file, "w", encoding=encoding) as f:
         writer = csv.writer(f, lineterminator="\n")
-        header = ["Date", "Compte", "Solde"]
         b_tag_keys = all_tags(bassertions)
-        header += b_tag_keys
-        writer.writerow(header)
-        for b in bassertions:
-            row = [b.date, short_name(b.acc_qname).qstr, b.balance]
-            for k in b_tag_keys:
-                row.append(b.tags.get(k, ""))
-            writer.writerow(row)
+        writer.writerow(["Date", "Compte", "Solde", *b_tag_keys])
+        writer.writerows([b.date, short_name(b.acc_qname).qstr, b.balance,
+                          *(b.tags.get(k, "") for k in b_tag_keys)]
+                         for b in bassertions)
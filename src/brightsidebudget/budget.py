@@ -1,12 +1,24 @@
 import csv
+from bisect import bisect_left, bisect_right
 from datetime import date, datetime, timedelta
 from decimal import Decimal
+from typing import Iterator
 from dateutil.rrule import rrule, DAILY, WEEKLY, MONTHLY, YEARLY
 from dateutil.relativedelta import relativedelta
-from brightsidebudget.account import QName, clean_tags
+from brightsidebudget.account import QName
+from brightsidebudget.tag import row_tags
 from brightsidebudget.txn import Posting, Txn
 
 
+_FREQUENCIES = {
+    "quotidien": DAILY,
+    "hebdomadaire": WEEKLY,
+    "mensuel": MONTHLY,
+    "annuel": YEARLY,
+}
+_FREQUENCY_NAMES = {v: k for k, v in _FREQUENCIES.items()}
+
+
 class RPosting():
     """
     A RPosting (recurrent posting) is a posting that occurs at regular intervals.
@@ -23,16 +35,10 @@ class RPosting():
         self.tags = tags or {}
         self.frequency = frequency
         if isinstance(self.frequency, str):
-            if self.frequency.lower() == "quotidien":
-                self.frequency = DAILY
-            elif self.frequency.lower() == "hebdomadaire":
-                self.frequency = WEEKLY
-            elif self.frequency.lower() == "mensuel":
-                self.frequency = MONTHLY
-            elif self.frequency.lower() == "annuel":
-                self.frequency = YEARLY
-            else:
+            freq = _FREQUENCIES.get(self.frequency.lower())
+            if freq is None:
                 raise ValueError(f'Invalid frequency {self.frequency}')
+            self.frequency = freq
         self.interval = interval
         if self.frequency is not None and self.interval is None:
             raise ValueError('Interval must be set when frequency is set')
@@ -51,9 +57,15 @@ class RPosting():
         elif self.count:
             r = rrule(self.frequency, dtstart=s, interval=self.interval, count=self.count)
         else:
-            r = rrule(self.frequency, dtstart=s, interval=self.interval)
+            # Infinite rule, let dateutil cache the occurrences already computed
+            r = rrule(self.frequency, dtstart=s, interval=self.interval, cache=True)
         self._rrule = r
 
+        # A finite rule is computed once, and the queries are bisections
+        self._dates: list[date] | None = None
+        if self.frequency is None or self.until or self.count:
+            self._dates = [d.date() for d in r]
+
     def postings_for_month(self, month: date) -> list[Posting]:
         """
         Return the total amount for the month.
@@ -75,25 +87,24 @@ class RPosting():
         Return a list of postings for the period [start, end] inclusive.
         """
         ls = []
-        sd = datetime(start.year, start.month, start.day)
-        ed = datetime(end.year, end.month, end.day)
-        for d in self._rrule.between(sd, ed, inc=True):
-            p = Posting(txnid=txnid, date=d.date(), acc_qname=self.acc_qname, amount=self.amount,
+        if self._dates is not None:
+            # The bounds may be datetime objects
+            sd = date(start.year, start.month, start.day)
+            ed = date(end.year, end.month, end.day)
+            dates = self._dates[bisect_left(self._dates, sd):bisect_right(self._dates, ed)]
+        else:
+            sd = datetime(start.year, start.month, start.day)
+            ed = datetime(end.year, end.month, end.day)
+            dates = [d.date() for d in self._rrule.between(sd, ed, inc=True)]
+        for d in dates:
+            p = Posting(txnid=txnid, date=d, acc_qname=self.acc_qname, amount=self.amount,
                         comment=self.comment, tags=self.tags.copy())
             ls.append(p)
             txnid += 1
         return ls
 
     def __str__(self):
-        freq = ""
-        if self.frequency == DAILY:
-            freq = "quotidien"
-        elif self.frequency == WEEKLY:
-            freq = "hebdomadaire"
-        elif self.frequency == MONTHLY:
-            freq = "mensuel"
-        elif self.frequency == YEARLY:
-            freq = "annuel"
+        freq = _FREQUENCY_NAMES.get(self.frequency, "")
         if freq:
             freq = " " + freq
         comment = f" {self.comment}" if self.comment else ""
@@ -117,6 +128,8 @@ def load_rpostings(rpostings: str, encoding: str = "utf8") -> list[RPosting]:
     def empty_is_none(x: str | None) -> str | None:
         return None if x == '' else x
 
+    xs = frozenset(["Compte", "Commentaire", "Montant", "Date de début", "Fréquence",
+                    "Intervalle", "Nombre de fois", "Date de fin"])
     ts = []
     with open(rpostings, 'r', encoding=encoding) as f:
         reader = csv.DictReader(f)
@@ -136,11 +149,7 @@ def load_rpostings(rpostings: str, encoding: str = "utf8") -> list[RPosting]:
             until = empty_is_none(row.get("Date de fin"))
             if until:
                 until = date.fromisoformat(until)
-            d = row.copy()
-            ctx = f"{start} {acc} {amount}"
-            xs = ["Compte", "Commentaire", "Montant", "Date de début", "Fréquence",
-                  "Intervalle", "Nombre de fois", "Date de fin"]
-            clean_tags(d, forbidden=xs, err_ctx=ctx)
+            d = row_tags(row, forbidden=xs, err_ctx=f"{start} {acc} {amount}")
 
             ts.append(RPosting(start=start, acc_qname=acc, amount=amount,
                                comment=comment, frequency=frequency, interval=interval,
@@ -165,10 +174,17 @@ class Budget():
         between start_date and end_date. The counterpart account is used to
         balance the transactions.
         """
+        return list(self.iter_budget_txns(start_date, end_date, counterpart))
+
+    def iter_budget_txns(self, start_date: date, end_date: date,
+                         counterpart: QName | str) -> Iterator[Txn]:
+        """
+        Like budget_txns, but yields the transactions one target at a time
+        instead of building the whole list.
+        """
         if isinstance(counterpart, str):
             counterpart = QName(qname=counterpart)
         id = 1
-        txns: list[Txn] = []
         for r in self.rpostings:
             xs = r.postings_between(start=start_date, end=end_date, txnid=id)
             for p in xs:
@@ -176,7 +192,5 @@ class Budget():
                              amount=-p.amount, comment=p.comment,
                              stmt_desc=p.stmt_desc, stmt_date=p.stmt_date,
                              tags=p.tags.copy())
-                txns.append(Txn([p, p2]))
+                yield Txn([p, p2])
             id += len(xs)
-
-        return txns
@@ -2,7 +2,8 @@ from pathlib import PosixPath
 from datetime import date, timedelta
 from decimal import Decimal
 from typing import Callable, Iterable, Union
-from brightsidebudget.account import Account, ChartOfAccounts, QName, load_accounts, write_accounts
+from brightsidebudget.account import (Account, ChartOfAccounts, QName, TOP_ACCOUNTS,
+                                      load_accounts, write_accounts)
 from brightsidebudget.bassertion import BAssertion, load_balances, write_bassertions
 from brightsidebudget.budget import Budget, RPosting, load_rpostings
 from brightsidebudget.tag import all_tags
@@ -49,8 +50,7 @@ class Journal():
         Adds a list of accounts to the journal.
         """
         for a in accs:
-            if a.qname.qlist[0] not in ["Actifs", "Passifs", "Capitaux propres",
-                                        "Revenus", "Dépenses"]:
+            if a.qname.qlist[0] not in TOP_ACCOUNTS:
                 raise ValueError(f"Illegal first element: {a.qname.qlist[0]}.\
                                 First element must be one of Actifs, Passifs,\
                                 Capitaux propres, Revenus, Dépenses.")
@@ -66,7 +66,9 @@ class Journal():
         if not isinstance(txns, list):
             txns = [txns]
 
-        # Validate postings
+        # Validate postings. The accounts already validated are remembered
+        # with their full qname since the same accounts appear many times.
+        full_qnames: dict[QName | str, QName] = {}
         id = self._next_txn_id
         for t in txns:
             for p in t.postings:
@@ -75,15 +77,21 @@ class Journal():
                 elif p.txnid in self.txns_dict:
                     raise ValueError(f'Transaction {p.txnid} already exists')
 
-                if not self.chartOfAccounts.is_valid_qname(p.acc_qname):
-                    msg = f'Txn {p.txnid}: Account {p.acc_qname} does not exist or is ambiguous'
-                    raise ValueError(msg)
+                full_qname = full_qnames.get(p.acc_qname)
+                if full_qname is None:
+                    if not self.chartOfAccounts.is_valid_qname(p.acc_qname):
+                        msg = (f'Txn {p.txnid}: Account {p.acc_qname} does not exist '
+                               'or is ambiguous')
+                        raise ValueError(msg)
 
-                # Update to full qname
-                p.acc_qname = self.chartOfAccounts.full_qname(p.acc_qname)
+                    full_qname = self.chartOfAccounts.full_qname(p.acc_qname)
+                    if not self.chartOfAccounts.is_leaf_account(full_qname):
+                        msg = f'Txn {p.txnid}: Account {full_qname} is not a leaf account'
+                        raise ValueError(msg)
+                    full_qnames[p.acc_qname] = full_qname
 
-                if not self.chartOfAccounts.is_leaf_account(p.acc_qname):
-                    raise ValueError(f'Txn {p.txnid}: Account {p.acc_qname} is not a leaf account')
+                # Update to full qname
+                p.acc_qname = full_qname
 
             id += 1
 
@@ -105,20 +113,33 @@ class Journal():
         if not isinstance(bassertions, list):
             bassertions = [bassertions]
 
-        for b in bassertions:
-            if not self.chartOfAccounts.is_valid_qname(b.acc_qname):
-                raise ValueError(f'Account {b.acc_qname} does not exist or is ambiguous')
-
-            # Update to full qname
-            b.acc_qname = self.chartOfAccounts.full_qname(b.acc_qname)
+        # Accounts whose assertions are no longer in date order
+        unsorted: set[QName] = set()
+        try:
+            for b in bassertions:
+                if not self.chartOfAccounts.is_valid_qname(b.acc_qname):
+                    raise ValueError(f'Account {b.acc_qname} does not exist or is ambiguous')
 
-            # Check for duplicates
-            if b.acc_qname not in self.bassertions_dict:
-                self.bassertions_dict[b.acc_qname] = {}
-            if b.date in self.bassertions_dict[b.acc_qname]:
-                raise ValueError(f'BAssertion {b.date} {b.acc_qname} already exists')
-
-            self.bassertions_dict[b.acc_qname][b.date] = b
+                # Update to full qname
+                b.acc_qname = self.chartOfAccounts.full_qname(b.acc_qname)
+
+                # Check for duplicates
+                if b.acc_qname not in self.bassertions_dict:
+                    self.bassertions_dict[b.acc_qname] = {}
+                bs = self.bassertions_dict[b.acc_qname]
+                if b.date in bs:
+                    raise ValueError(f'BAssertion {b.date} {b.acc_qname} already exists')
+
+                if bs and b.acc_qname not in unsorted and b.date < next(reversed(bs)):
+                    unsorted.add(b.acc_qname)
+                bs[b.date] = b
+        finally:
+            # Keep the assertions of each account in date order
+            for q in unsorted:
+                bs = self.bassertions_dict[q]
+                items = sorted(bs.items())
+                bs.clear()
+                bs.update(items)
 
     def add_targets(self, targets: list[RPosting]):
         """
@@ -175,9 +196,13 @@ class Journal():
     def from_csv(cls, *, accounts: str, postings: str | list[str] | None = None,
                  bassertions: str | None = None,
                  targets: str | None = None,
-                 encoding: str = 'utf-8'):
+                 encoding: str = 'utf-8',
+                 workers: int | None = None):
         """
         Loads a journal from CSV files.
+
+        If workers is greater than one, the postings files are parsed in
+        parallel by a pool of that many processes.
         """
         if postings is None:
             postings = []
@@ -188,7 +213,7 @@ class Journal():
         accs = load_accounts(accounts, encoding=encoding)
         j.add_accounts(accs)
 
-        txns: list[Txn] = load_txns(postings, encoding=encoding)
+        txns: list[Txn] = load_txns(postings, encoding=encoding, workers=workers)
         j.add_txns(txns, overwrite_txnid=False)
 
         if bassertions is not None:
@@ -221,15 +246,23 @@ class Journal():
         """
         Writes the transactions to a CSV file.
         """
-        txns = self.txns
-        if renumber:
-            txns = [t.copy() for t in txns]
-            txns.sort(key=lambda x: (x.date, x.txnid))
+        if not renumber:
+            write_txns(txns=self.txns, filefunc=filefunc, encoding=encoding,
+                       short_name=self.chartOfAccounts.short_qname)
+            return
+
+        # Renumber the transactions in place rather than copying them, and
+        # restore the journal ids once written.
+        txns = sorted(self.txns, key=lambda x: (x.date, x.txnid))
+        old_ids = [t.txnid for t in txns]
+        try:
             for i, t in enumerate(txns):
                 t.txnid = i + 1
-
-        write_txns(txns=txns, filefunc=filefunc, encoding=encoding,
-                   short_name=self.chartOfAccounts.short_qname)
+            write_txns(txns=txns, filefunc=filefunc, encoding=encoding,
+                       short_name=self.chartOfAccounts.short_qname)
+        finally:
+            for t, txnid in zip(txns, old_ids):
+                t.txnid = txnid
 
     def export_txns(self, file: str, encoding: str = 'utf-8',
                     txns: list[Txn] | None = None):
@@ -305,9 +338,14 @@ class Journal():
         """
         Returns the last balance assertion for the account.
         """
-        bs = self.account_bassertions(qname)
+        if isinstance(qname, str):
+            qname = QName(qname=qname)
+
+        # The assertions are already grouped by account and keyed by date
+        full_qname = self.chartOfAccounts.full_qname(qname)
+        bs = self.bassertions_dict.get(full_qname)
         if bs:
-            return bs[-1]
+            return next(reversed(bs.values()))
         else:
             return None
 
@@ -319,8 +357,7 @@ class Journal():
             qname = QName(qname=qname)
 
         full_qname = self.chartOfAccounts.full_qname(qname)
-        bs = self.bassertions_dict.get(full_qname, {}).values()
-        return sorted(bs, key=lambda x: x.date)
+        return list(self.bassertions_dict.get(full_qname, {}).values())
 
     def find_subset(self, amnt: Decimal,
                     qname: QName | str,
@@ -395,8 +432,18 @@ class Journal():
                     raise ValueError(msg)
             bs = self.account_bassertions(acc_qname)
 
+            def in_acc(p: Posting) -> bool:
+                return p.acc_qname == acc_qname or p.acc_qname.is_descendant_of(acc_qname)
+
+            # Sweep the account postings once in stmt_date order instead of
+            # recomputing the balance from scratch for each assertion
+            ps = sorted((p for p in self.postings if in_acc(p)), key=lambda p: p.stmt_date)
+            ps_idx = 0
+            actual = Decimal(0)
             for b in bs:
-                actual = self.balance(b.date, b.acc_qname, use_stmt_date=True)
+                while ps_idx < len(ps) and ps[ps_idx].stmt_date <= b.date:
+                    actual += ps[ps_idx].amount
+                    ps_idx += 1
                 diff = b.balance - actual
                 if diff == 0 and not force_zero_txn:
                     continue
@@ -409,6 +456,9 @@ class Journal():
                 t = Txn([p1, p2])
                 self.add_txns(t, overwrite_txnid=False)
                 txns.append(t)
+                # The new postings are dated b.date, so they count for the
+                # following assertions
+                actual += sum(p.amount for p in t.postings if in_acc(p))
         return txns
 
 
@@ -0,0 +1,61 @@
+from datetime import date
+from decimal import Decimal
+from functools import lru_cache
+from typing import Iterable, Iterator
+
+
+# Conversions of CSV cells. Dates and amounts repeat a lot in bank
+# statements and balance assertions, so the conversions are cached.
+
+@lru_cache(maxsize=8192)
+def to_date(s: str) -> date:
+    """
+    Converts an ISO formatted date.
+    """
+    return date.fromisoformat(s)
+
+
+@lru_cache(maxsize=8192)
+def to_decimal(s: str) -> Decimal:
+    """
+    Converts an amount to a Decimal.
+    """
+    return Decimal(s)
+
+
+def csv_rows(reader: Iterator[list[str]], header: list[str] | None = None,
+             ctx_cols: Iterable[str] | None = None
+             ) -> tuple[dict[str, int], Iterator[list[str]]]:
+    """
+    Reads the header of a csv.reader and returns the position of each column
+    with an iterator over the rows. If header is given, the file has no
+    header row and header names its columns.
+
+    Like csv.DictReader, a duplicated column name refers to the last column
+    and blank rows are skipped. Missing trailing columns are empty strings.
+    An empty file has no columns and no rows.
+
+    If ctx_cols is given, a row with more columns than the header raises
+    "Extra columns", prefixed by the row values of these columns. Otherwise
+    the extra columns are ignored.
+    """
+    if header is None:
+        header = next(reader, [])
+    idx = {h: i for i, h in enumerate(header)}
+    if not header:
+        return idx, iter(())
+    ctx_is = None if ctx_cols is None else [idx[c] for c in ctx_cols]
+    return idx, _padded_rows(reader, len(header), ctx_is)
+
+
+def _padded_rows(reader: Iterator[list[str]], n: int,
+                 ctx_is: list[int] | None) -> Iterator[list[str]]:
+    for row in reader:
+        if not row:
+            continue
+        if len(row) < n:
+            row += [""] * (n - len(row))
+        elif len(row) > n and ctx_is is not None:
+            ctx = " ".join(row[i] for i in ctx_is)
+            raise ValueError(f"{ctx}: Extra columns")
+        yield row
@@ -5,10 +5,16 @@ class HasTags():
     """
     A mixin class to add tags
     """
+    __slots__ = ("tags",)
+
     def __init__(self, tags: dict[str, Any] | None = None):
         self.tags = tags or {}
 
 
+def _is_empty(v: Any) -> bool:
+    return v is None or (isinstance(v, str) and (not v or v.isspace()))
+
+
 def clean_tags(tags: dict[str, Any], forbidden: list[str] = None, err_ctx: str = ""):
     """
     Remove empty tags from a dictionary.
@@ -16,16 +22,28 @@ def clean_tags(tags: dict[str, Any], forbidden: list[str] = None, err_ctx: str =
     if forbidden is None:
         forbidden = []
 
-    for x in forbidden:
-        tags.pop(x, None)
-    for k, v in list(tags.items()):
-        if v is None or (isinstance(v, str) and v.strip() == ""):
-            tags.pop(k)
-        if isinstance(v, list):
-            msg = "Extra columns"
-            if err_ctx:
-                msg = f"{err_ctx}: {msg}"
-            raise ValueError(msg)
+    kept = {k: v for k, v in tags.items() if k not in forbidden and not _is_empty(v)}
+    if any(isinstance(v, list) for v in kept.values()):
+        msg = "Extra columns"
+        if err_ctx:
+            msg = f"{err_ctx}: {msg}"
+        raise ValueError(msg)
+    tags.clear()
+    tags.update(kept)
+
+
+def row_tags(row: dict[str, Any], forbidden: Iterable[str] = (),
+             err_ctx: str = "") -> dict[str, Any]:
+    """
+    Returns the non-empty tags of a csv.DictReader row, without the forbidden
+    columns. The row is not modified.
+    """
+    if None in row:
+        msg = "Extra columns"
+        if err_ctx:
+            msg = f"{err_ctx}: {msg}"
+        raise ValueError(msg)
+    return {k: v for k, v in row.items() if k not in forbidden and v and not v.isspace()}
 
 
 def all_tags(ls: Iterable[HasTags]) -> list[str]:
@@ -1,16 +1,20 @@
 import csv
 from datetime import date
+from itertools import chain, repeat
 from pathlib import PosixPath
 from typing import Callable, Iterable, Union
 from decimal import Decimal
 from brightsidebudget.account import QName
-from brightsidebudget.tag import HasTags, all_tags, clean_tags
+from brightsidebudget.parsing import csv_rows
+from brightsidebudget.tag import HasTags, all_tags
 
 
 class Posting(HasTags):
     """
     A Posting represents a single entry on an account.
     """
+    __slots__ = ("txnid", "date", "acc_qname", "amount", "comment", "stmt_desc", "stmt_date")
+
     def __init__(self, *, txnid: int, date: date, acc_qname: Union[QName, str], amount: Decimal,
                  comment: Union[str, None] = None, stmt_desc: Union[str, None] = None,
                  stmt_date: Union[date, None] = None,
@@ -31,9 +35,18 @@ class Posting(HasTags):
         return self.__str__()
 
     def copy(self):
-        return Posting(txnid=self.txnid, date=self.date, acc_qname=self.acc_qname,
-                       amount=self.amount, comment=self.comment, stmt_desc=self.stmt_desc,
-                       stmt_date=self.stmt_date, tags=self.tags.copy())
+        # The fields are already validated, so the copy does not go through
+        # __init__. Only the mutable tags need to be copied.
+        p = Posting.__new__(Posting)
+        p.txnid = self.txnid
+        p.date = self.date
+        p.acc_qname = self.acc_qname
+        p.amount = self.amount
+        p.comment = self.comment
+        p.stmt_desc = self.stmt_desc
+        p.stmt_date = self.stmt_date
+        p.tags = self.tags.copy()
+        return p
 
 
 class Txn():
@@ -41,6 +54,8 @@ class Txn():
     A Txn represents a single transaction. It contains a list of Postings that all
     have the same date, same txnid and balance to zero.
     """
+    __slots__ = ("postings",)
+
     def __init__(self, postings: list[Posting]):
         self.postings = postings
         if not postings:
@@ -92,41 +107,65 @@ def txn_from_postings(postings: list[Posting]) -> list[Txn]:
     return [Txn(postings=ps) for ps in d.values()]
 
 
-def load_txns(files: str | list[str], encoding: str = 'utf-8') -> list[Txn]:
+_TXN_COLUMNS = frozenset(['No txn', 'Date', 'Compte', 'Montant', 'Date du relevé',
+                          'Commentaire', 'Description du relevé'])
+
+
+def _load_postings(p_file: str, encoding: str) -> list[Posting]:
+    """
+    Load the postings of a single CSV file.
+    """
+    ps: list[Posting] = []
+    with open(p_file, 'r', encoding=encoding, newline='') as f:
+        # No txn,Date,Compte,Montant,Date du relevé,Commentaire,Description du relevé
+        idx, rows = csv_rows(csv.reader(f), ctx_cols=['No txn'])
+        if not idx:
+            return ps
+        txn_i = idx['No txn']
+        date_i = idx['Date']
+        acc_i = idx['Compte']
+        amnt_i = idx['Montant']
+        comment_i = idx.get('Commentaire')
+        stmt_desc_i = idx.get('Description du relevé')
+        stmt_date_i = idx.get('Date du relevé')
+        tag_cols = [(i, h) for h, i in idx.items() if h not in _TXN_COLUMNS]
+        for row in rows:
+            txn_id = int(row[txn_i])
+            dt = date.fromisoformat(row[date_i])
+            acc = row[acc_i]
+            amnt = Decimal(row[amnt_i])
+            comment = (row[comment_i] or None) if comment_i is not None else None
+            stmt_desc = (row[stmt_desc_i] or None) if stmt_desc_i is not None else None
+            stmt_date = row[stmt_date_i] if stmt_date_i is not None else None
+            stmt_date = date.fromisoformat(stmt_date) if stmt_date else None
+            d = {h: row[i] for i, h in tag_cols if row[i] and not row[i].isspace()}
+
+            p = Posting(txnid=txn_id, date=dt, acc_qname=acc, amount=amnt,
+                        stmt_desc=stmt_desc, stmt_date=stmt_date, comment=comment,
+                        tags=d)
+            ps.append(p)
+    return ps
+
+
+def load_txns(files: str | list[str], encoding: str = 'utf-8',
+              workers: int | None = None) -> list[Txn]:
     """
     Load transactions from a list of CSV files.
+
+    If workers is greater than one and there are several files, the files are
+    parsed in parallel by a pool of that many processes.
     """
     if isinstance(files, (str, PosixPath)):
         files = [files]
 
-    def empty_is_none(x: str | None) -> str | None:
-        return None if x == '' else x
-
-    ps: list[Posting] = []
-    for p_file in files:
-        with open(p_file, 'r', encoding=encoding) as f:
-            reader = csv.DictReader(f)
-            # No txn,Date,Compte,Montant,Date du relevé,Commentaire,Description du relevé
-            for row in reader:
-                txn_id = int(row['No txn'])
-                dt = date.fromisoformat(row['Date'])
-                acc = row['Compte']
-                amnt = Decimal(row['Montant'])
-                comment = empty_is_none(row.get('Commentaire'))
-                stmt_desc = empty_is_none(row.get('Description du relevé'))
-                stmt_date = empty_is_none(row.get('Date du relevé'))
-                if stmt_date:
-                    stmt_date = date.fromisoformat(stmt_date)
-                d = row.copy()
-                xs = ['No txn', 'Date', 'Compte', 'Montant', 'Date du relevé', 'Commentaire',
-                      'Description du relevé']
-                clean_tags(d, forbidden=xs, err_ctx=f'{txn_id}')
-
-                p = Posting(txnid=txn_id, date=dt, acc_qname=acc, amount=amnt,
-                            stmt_desc=stmt_desc, stmt_date=stmt_date, comment=comment,
-                            tags=d)
-                ps.append(p)
-    return txn_from_postings(ps)
+    if workers is not None and workers > 1 and len(files) > 1:
+        # Imported here because multiprocessing is slow to import
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(_load_postings, files, repeat(encoding)))
+    else:
+        results = [_load_postings(p_file, encoding) for p_file in files]
+    return txn_from_postings(list(chain.from_iterable(results)))
 
 
 def write_txns(*,
@@ -160,17 +199,10 @@ def write_txns(*,
     for file, ps in file_dict.items():
         with open(file, "w", encoding=encoding) as f:
             writer = csv.writer(f, lineterminator="\n")
-            header = ["No txn", "Date", "Compte", "Montant", "Date du relevé", "Commentaire",
-                      "Description du relevé"]
             p_tag_keys = all_tags(ps)
-            header += p_tag_keys
-
-            writer.writerow(header)
-            for p in ps:
-                txnid = p.txnid
-                name = short_name(p.acc_qname).qstr
-                row = [txnid, p.date, name, p.amount, p.stmt_date, p.comment, p.stmt_desc]
-                for k in p_tag_keys:
-                    row.append(p.tags.get(k, ''))
-
-                writer.writerow(row)
+            writer.writerow(["No txn", "Date", "Compte", "Montant", "Date du relevé",
+                             "Commentaire", "Description du relevé", *p_tag_keys])
+            writer.writerows([p.txnid, p.date, short_name(p.acc_qname).qstr, p.amount,
+                              p.stmt_date, p.comment, p.stmt_desc,
+                              *(p.tags.get(k, '') for k in p_tag_keys)]
+                             for p in ps)
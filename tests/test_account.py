@@ -1,12 +1,12 @@
 import pytest
 from brightsidebudget import QName
-from brightsidebudget.account import Account
+from brightsidebudget.account import Account, load_accounts
 
 
 def test_qname():
     qname = QName("A:B:C")
     assert qname._qstr == "A:B:C"
-    assert qname._qlist == ["A", "B", "C"]
+    assert qname._qlist == ("A", "B", "C")
     assert qname.depth == 3
     assert qname.parent == QName("A:B")
     assert qname.parent.parent == QName("A")
@@ -22,6 +22,7 @@ def test_qname():
     assert QName("A").parent is None
 
     assert QName("A:B:C") == QName(["A", "B", "C"])
+    assert QName("A:B:C") == QName(("A", "B", "C"))
 
     assert QName("A") < QName("B")
     assert QName("A") < QName("A:B")
@@ -44,6 +45,12 @@ def test_qname():
     with pytest.raises(ValueError):
         QName(["A:B"])
 
+    class S(str):
+        pass
+
+    assert QName(S("A:B")) == QName("A:B")
+    assert QName([S("A"), "B"]) == QName("A:B")
+
 
 def test_account():
     acc = Account(qname="A:B:C")
@@ -61,3 +68,17 @@ def test_sort():
 
     ls = [a1, a2, a3, a4]
     assert sorted(ls, key=lambda x: x.qname.sort_key) == [a2, a1, a4, a3]
+
+
+def test_load_accounts_empty_file(tmp_path):
+    f = tmp_path / "empty.csv"
+    f.write_text("", encoding="utf-8")
+    assert load_accounts(str(f)) == []
+
+
+def test_load_accounts_duplicated_column(tmp_path):
+    f = tmp_path / "accounts.csv"
+    f.write_text("Compte,T,Compte\nX,t,Actifs\n", encoding="utf-8")
+    accs = load_accounts(str(f))
+    assert accs[0].qname == QName("Actifs")
+    assert accs[0].tags == {"T": "t"}
@@ -1,6 +1,6 @@
 from datetime import date
 from decimal import Decimal
-from brightsidebudget import BAssertion, QName
+from brightsidebudget import BAssertion, QName, load_balances
 
 
 def test_bassertion():
@@ -13,3 +13,17 @@ def test_bassertion():
     b2 = BAssertion(date=date(2021, 1, 1), acc_qname="A:B:C", balance=Decimal("100.00"),
                     tags={"tag1": "value1"})
     assert b2.tags["tag1"] == "value1"
+
+
+def test_load_balances_empty_file(tmp_path):
+    f = tmp_path / "empty.csv"
+    f.write_text("", encoding="utf-8")
+    assert load_balances(str(f)) == []
+
+
+def test_load_balances_duplicated_column(tmp_path):
+    f = tmp_path / "balances.csv"
+    f.write_text('Date,Compte,Solde,T,T\n2021-01-01,Actifs,10,x,""\n', encoding="utf-8")
+    bs = load_balances(str(f))
+    assert bs[0].balance == Decimal(10)
+    assert bs[0].tags == {}
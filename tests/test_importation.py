@@ -1,3 +1,4 @@
+from datetime import date
 from brightsidebudget import Journal, import_bank_csv, BankCsv
 from brightsidebudget.txn import Posting, Txn
 
@@ -32,3 +33,46 @@ def test_remove_delemiter_from(bank_checking_bad_delimiter, accounts_file, txns_
     j = Journal.from_csv(accounts=accounts_file, postings=txns_file)
     txns = import_bank_csv(j, bank, classifier)
     assert len(txns) == 4
+
+
+def test_read_bank_csv_many(bank_checking_file, accounts_file, txns_file):
+    bank = BankCsv(file=bank_checking_file, qname="Chèque", date_col="Date",
+                   amount_in_col="Credit", amount_out_col="Debit",
+                   stmt_desc_cols=["Description"])
+    j = Journal.from_csv(accounts=accounts_file, postings=txns_file)
+    # The second import of the same file only finds duplicates
+    txns = import_bank_csv(j, [bank, bank], classifier)
+    assert len(txns) == 4
+    assert len(j.txns_dict) == 6
+
+
+def test_read_bank_csv_empty_stmt_date(tmp_path):
+    f = tmp_path / "bank.csv"
+    f.write_text("Date,SD,Description,Amount\n"
+                 "2021-01-06,2021-01-08,Super market,-140\n"
+                 "2021-01-05,,Electricity Inc,-50\n", encoding="utf-8")
+    bank = BankCsv(file=str(f), qname="Chèque", date_col="Date", amount_col="Amount",
+                   stmt_date_col="SD", stmt_desc_cols=["Description"])
+    ps = bank.import_bank_postings()
+    assert len(ps) == 2
+    assert ps[0].stmt_date == date(2021, 1, 8)
+    assert ps[1].stmt_date == date(2021, 1, 5)
+
+
+def test_remove_overlapping_delimiters(tmp_path):
+    f = tmp_path / "bank.csv"
+    f.write_text("Date,Amount,Description,E\n"
+                 "2021-01-06,-140,A,B,C\n", encoding="utf-8")
+    bank = BankCsv(file=str(f), qname="Chèque", date_col="Date", amount_col="Amount",
+                   remove_delimiter_from=["A,B", "B,C"], stmt_desc_cols=["Description"])
+    ps = bank.import_bank_postings()
+    assert len(ps) == 1
+    assert ps[0].stmt_desc == "ABC"
+    assert not ps[0].tags.get("E")
+
+
+def test_load_bank_csv_empty_file(tmp_path):
+    f = tmp_path / "empty.csv"
+    f.write_text("", encoding="utf-8")
+    bank = BankCsv(file=str(f), qname="Chèque", date_col="Date", amount_col="Amount")
+    assert bank.import_bank_postings() == []
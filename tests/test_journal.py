@@ -239,3 +239,41 @@ def test_flow(accounts_file, txns_file):
     assert j.flow(date(2021, 1, 1), date(2021, 1, 31), 'Actifs') == Decimal(467460)
     with pytest.raises(ValueError):
         j.flow(date(2021, 1, 31), date(2021, 1, 1), 'Actifs:Chèque')
+
+
+def test_write_txns_renumber(accounts_file, txns_file, tmp_path):
+    j = Journal.from_csv(accounts=accounts_file, postings=txns_file)
+    t = j.txns_dict.pop(1)
+    t.txnid = 10
+    j.txns_dict[10] = t
+    tmp_file = tmp_path / 'txns.csv'
+    j.write_txns(filefunc=tmp_file, renumber=True)
+
+    j2 = Journal.from_csv(accounts=accounts_file, postings=tmp_file)
+    assert sorted(j2.txns_dict) == [1, 2]
+    # The journal keeps its own ids
+    assert sorted(j.txns_dict) == [2, 10]
+    assert j.txns_dict[10].txnid == 10
+
+
+def test_last_bassertion(accounts_file, bassertions_file):
+    j = Journal.from_csv(accounts=accounts_file, bassertions=bassertions_file)
+    j.add_bassertions(BAssertion(date=date(2021, 2, 1), acc_qname='Chèque',
+                                 balance=Decimal(100)))
+    b = j.last_bassertion('Chèque')
+    assert b.date == date(2021, 2, 1)
+    assert [b.date for b in j.account_bassertions('Chèque')] == [date(2021, 1, 1),
+                                                                 date(2021, 2, 1)]
+    assert j.last_bassertion('Salaire') is None
+
+
+def test_bassertions_date_order(accounts_file):
+    j = Journal.from_csv(accounts=accounts_file)
+    j.add_bassertions(BAssertion(date=date(2021, 3, 1), acc_qname='Chèque', balance=Decimal(3)))
+    bs = j.bassertions_dict[QName('Actifs:Chèque')]
+    j.add_bassertions([BAssertion(date=date(2021, 4, 1), acc_qname='Chèque', balance=Decimal(4)),
+                       BAssertion(date=date(2021, 1, 1), acc_qname='Chèque', balance=Decimal(1)),
+                       BAssertion(date=date(2021, 2, 1), acc_qname='Chèque', balance=Decimal(2))])
+    # The dict is sorted in place
+    assert j.bassertions_dict[QName('Actifs:Chèque')] is bs
+    assert [b.balance for b in j.account_bassertions('Chèque')] == [1, 2, 3, 4]
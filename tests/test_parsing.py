@@ -0,0 +1,21 @@
+import csv
+import pytest
+from brightsidebudget.parsing import csv_rows
+
+
+def test_csv_rows():
+    lines = ["A,B,A", "1,2,3", "", "4", "5,6,7,8"]
+    idx, rows = csv_rows(csv.reader(lines))
+    assert idx == {"A": 2, "B": 1}
+    assert list(rows) == [["1", "2", "3"], ["4", "", ""], ["5", "6", "7", "8"]]
+
+    idx, rows = csv_rows(csv.reader(lines), ctx_cols=["B"])
+    with pytest.raises(ValueError, match="^6: Extra columns$"):
+        list(rows)
+
+    idx, rows = csv_rows(csv.reader(["1,2"]), header=["X", "Y"])
+    assert list(rows) == [["1", "2"]]
+
+    idx, rows = csv_rows(csv.reader([]), ctx_cols=["B"])
+    assert idx == {}
+    assert list(rows) == []
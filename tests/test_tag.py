@@ -0,0 +1,19 @@
+import pytest
+from brightsidebudget.tag import clean_tags
+
+
+def test_clean_tags():
+    tags = {"A": "a", "B": "", "C": "  ", "D": None, "E": "e", "F": 0}
+    clean_tags(tags, forbidden=["E"])
+    assert tags == {"A": "a", "F": 0}
+
+    # A forbidden column may hold the extra columns of csv.DictReader
+    tags = {"A": "a", None: ["x"]}
+    clean_tags(tags, forbidden=[None])
+    assert tags == {"A": "a"}
+
+    with pytest.raises(ValueError, match="^Extra columns$"):
+        clean_tags({"A": "a", None: ["x"]})
+
+    with pytest.raises(ValueError, match="^1: Extra columns$"):
+        clean_tags({"A": "a", None: ["x"]}, err_ctx="1")
@@ -1,7 +1,7 @@
-from datetime import date
+from datetime import date, datetime
 from decimal import Decimal
 import pytest
-from brightsidebudget import Posting, QName, Txn, RPosting
+from brightsidebudget import Budget, Posting, QName, Txn, RPosting, load_txns, write_txns
 
 
 def test_posting():
@@ -74,3 +74,44 @@ def test_rposting():
     assert ps[0].date == date(2021, 1, 1)
     assert ps[1].date == date(2021, 3, 1)
     assert ps[2].date == date(2021, 5, 1)
+
+    # Precomputed occurrences of a rule with an end date
+    r5 = RPosting(start=date(2021, 1, 31), acc_qname="A:B:C", amount=Decimal("100.00"),
+                  frequency="hebdomadaire", interval=1, until=date(2021, 2, 21))
+    ps = r5.postings_between(date(2021, 2, 1), date(2021, 12, 31))
+    assert [p.date for p in ps] == [date(2021, 2, 7), date(2021, 2, 14), date(2021, 2, 21)]
+    ps = r5.postings_between(datetime(2021, 1, 31, 12), datetime(2021, 2, 7))
+    assert [p.date for p in ps] == [date(2021, 1, 31), date(2021, 2, 7)]
+    assert r5.postings_between(date(2021, 2, 22), date(2021, 3, 31)) == []
+
+
+def test_budget_txns():
+    r1 = RPosting(start=date(2021, 1, 1), acc_qname="A:B:C", amount=Decimal("100.00"),
+                  frequency="mensuel", interval=1)
+    r2 = RPosting(start=date(2021, 1, 15), acc_qname="A:B:D", amount=Decimal("10.00"))
+    budget = Budget([r1, r2])
+    it = budget.iter_budget_txns(date(2021, 1, 1), date(2021, 3, 31), "A:E")
+    assert next(it).postings[1].acc_qname == QName("A:E")
+    txns = budget.budget_txns(date(2021, 1, 1), date(2021, 3, 31), "A:E")
+    assert [t.txnid for t in txns] == [1, 2, 3, 4]
+    assert [t.date for t in txns] == [date(2021, 1, 1), date(2021, 2, 1), date(2021, 3, 1),
+                                      date(2021, 1, 15)]
+    assert all(t.postings[1].amount == -t.postings[0].amount for t in txns)
+
+
+def test_load_txns_workers(txns_file, tmp_path):
+    txns = load_txns(txns_file)
+    write_txns(txns=txns, filefunc=lambda t: tmp_path / f'txns_{t.txnid}.csv')
+    files = sorted(tmp_path.glob('*.csv'))
+    assert len(files) == 2
+
+    txns2 = load_txns(files, workers=2)
+    assert [t.txnid for t in txns2] == [t.txnid for t in txns]
+    qnames = {p.acc_qname for t in txns for p in t.postings}
+    assert qnames == {p.acc_qname for t in txns2 for p in t.postings}
+
+
+def test_load_txns_empty_file(tmp_path):
+    f = tmp_path / "empty.csv"
+    f.write_text("", encoding="utf-8")
+    assert load_txns(str(f)) == []